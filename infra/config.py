@@ -7,8 +7,12 @@ Não contém lógica de negócio, apenas utilitários de infraestrutura.
 """
 import os
 import json
+from functools import lru_cache
 
+
+@lru_cache(maxsize=1)
 def get_config():
+    """Lê o config.json uma única vez por processo (resultado compartilhado, não modificar)."""
     config_path = os.path.join(os.path.dirname(__file__), '..', 'config.json')
     if os.path.exists(config_path):
         with open(config_path, 'r', encoding='utf-8') as f:
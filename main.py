@@ -9,10 +9,26 @@ Não contém lógica de negócio, apenas orquestração e interface (CLI).
 
 import argparse
 import os
+import re
+from functools import lru_cache
 from infra.config import get_config
 from video_creator.core import criar_video
 
-def main():
+# Extensões aceitas na pasta de imagens (tupla para str.endswith)
+_EXTS = ('.jpg', '.jpeg', '.png', '.bmp', '.gif')
+
+# Imagens numeradas (1.png, 2.jpg, ...) seguem a ordem numérica, não a lexicográfica
+_NOME_NUMERICO = re.compile(r'^(\d+)\.[^.]+$')
+
+
+def _ordem_imagem(nome):
+    m = _NOME_NUMERICO.match(nome)
+    return (0, int(m.group(1)), nome) if m else (1, 0, nome)
+
+
+@lru_cache(maxsize=1)
+def build_parser():
+    """Monta o parser de argumentos da CLI (construído uma vez por processo)."""
     parser = argparse.ArgumentParser(description="Cria um vídeo a partir de uma narração e imagens usando FFmpeg.")
     parser.add_argument('--audio', required=True, help='Arquivo de áudio da narração (ex: narracao.mp3)')
     # Não exige mais o argumento --imagens
@@ -20,7 +36,11 @@ def main():
     parser.add_argument('--efeito', choices=['fade', 'zoom', 'pendulo', 'simplezoom', 'none'], default='none', help="Efeito visual nas imagens: 'fade' (padrão), 'zoom', 'pendulo', 'simplezoom' ou 'none' (sem efeito)")
     parser.add_argument('--encoder', choices=['libx264', 'h264_nvenc'], default='libx264', help="Encoder de vídeo: 'libx264' (CPU, padrão) ou 'h264_nvenc' (GPU NVIDIA)")
     parser.add_argument('--saida', required=True, help='Arquivo de saída do vídeo (ex: video.mp4)')
-    args = parser.parse_args()
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
 
     # Lê configurações do arquivo config.json via camada infra
     config = get_config()
@@ -31,8 +51,10 @@ def main():
 
     # Busca todas as imagens da pasta configurada
     if pasta_imagens:
-        exts = ('.jpg', '.jpeg', '.png', '.bmp', '.gif')
-        imagens = [os.path.join(pasta_imagens, f) for f in sorted(os.listdir(pasta_imagens)) if f.lower().endswith(exts)]
+        # Uma única leitura do diretório; DirEntry já traz o tipo, sem stat extra por arquivo
+        with os.scandir(pasta_imagens) as entries:
+            nomes = sorted((e.name for e in entries if e.is_file() and e.name.lower().endswith(_EXTS)), key=_ordem_imagem)
+        imagens = [os.path.join(pasta_imagens, f) for f in nomes]
         if not imagens:
             print(f"Nenhuma imagem encontrada em {pasta_imagens}")
             return
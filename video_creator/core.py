@@ -2,16 +2,22 @@
 # Função principal de criação de vídeo (exportável)
 # ==========================
 
-def criar_video(audio_path, imagens, saida, segment_duration=3, transicao=None, efeito='fade', encoder='libx264', ffmpeg_path=None, ffprobe_path=None):
+def criar_video(audio_path, imagens, saida, segment_duration=3, transicao=None, efeito='fade', encoder='libx264', ffmpeg_path=None, ffprobe_path=None, hide_console=False):
     """
     Função principal para criar vídeo sincronizado com narração e imagens.
     ffmpeg_path e ffprobe_path são obrigatórios (injeção de dependência).
+    hide_console=True: para hosts GUI no Windows, lança ffmpeg/ffprobe sem janela de console
+    (os filhos deixam de receber Ctrl+C; não usar na CLI).
     """
     if ffmpeg_path is None or ffprobe_path is None:
         raise ValueError('ffmpeg_path e ffprobe_path devem ser fornecidos')
+    # Resolve os executáveis uma vez (evita busca no PATH a cada processo lançado)
+    ffmpeg_path = shutil.which(ffmpeg_path) or ffmpeg_path
+    ffprobe_path = shutil.which(ffprobe_path) or ffprobe_path
+    creationflags = _creationflags(hide_console)
 
     # Descobre a duração do áudio
-    dur_audio = get_audio_duration(audio_path, ffprobe_path)
+    dur_audio = get_audio_duration(audio_path, ffprobe_path, creationflags=creationflags)
     if dur_audio == 0:
         print("Não foi possível obter a duração do áudio.")
         return
@@ -19,29 +25,36 @@ def criar_video(audio_path, imagens, saida, segment_duration=3, transicao=None,
     # Ajuste de contagem de imagens
     transition = min(1.0, segment_duration * 0.3) if transicao else 0
     if transicao:
-        # Soma total: n*segment_duration - (n-1)*transition >= dur_audio
-        n_imagens = max(2, int((dur_audio + transition) / (segment_duration - transition)) + 2)
+        # Segmentos pré-renderizados têm um número inteiro de quadros (_frames_segmento), então a
+        # cobertura, os offsets do xfade e os recortes usam todos essa mesma duração quantizada
+        seg_real = _frames_segmento(segment_duration) / _FRAMERATE
+        # Soma total: n*seg_real - (n-1)*transition >= dur_audio
+        #   <=> n >= (dur_audio - transition) / (seg_real - transition)
+        n_imagens = max(2, math.ceil((dur_audio - transition) / (seg_real - transition)))
+        assert n_imagens * seg_real - (n_imagens - 1) * transition >= dur_audio - 1e-6, 'imagens não cobrem a narração'
     else:
-        n_imagens = int(dur_audio // segment_duration) + 1
+        # n*segment_duration >= dur_audio (concat demuxer usa a duração exata de cada imagem)
+        n_imagens = max(1, math.ceil(dur_audio / segment_duration))
+        assert n_imagens * segment_duration >= dur_audio - 1e-6, 'imagens não cobrem a narração'
 
     imagens_repetidas = [imagens[i % len(imagens)] for i in range(n_imagens)]
 
     if not transicao:
         # Caminho simples (sem transição): concat demuxer de imagens estáticas
         lista_imagens = 'imagens.txt'
-        with open(lista_imagens, 'w', encoding='utf-8') as f:
-            for img in imagens_repetidas:
-                f.write(f"file '{os.path.abspath(img)}'\n")
-                f.write(f"duration {segment_duration}\n")
-            f.write(f"file '{os.path.abspath(imagens_repetidas[-1])}'\n")
+        abs_paths = {img: os.path.abspath(img) for img in imagens}
+        linhas = [f"file '{abs_paths[img]}'\nduration {segment_duration}\n" for img in imagens_repetidas]
+        linhas.append(f"file '{abs_paths[imagens_repetidas[-1]]}'\n")
+        Path(lista_imagens).write_text(''.join(linhas), encoding='utf-8')
         cmd = [
             ffmpeg_path,
             '-y',
+            '-loglevel', 'error', '-nostats',
             '-f', 'concat',
             '-safe', '0',
             '-i', lista_imagens,
             '-i', audio_path,
-            '-c:v', encoder, *get_encoder_flags(encoder, framerate=30),
+            '-c:v', encoder, *get_encoder_flags(encoder, framerate=_FRAMERATE),
             '-c:a', 'aac',
             '-pix_fmt', 'yuv420p',
             '-shortest',
@@ -50,7 +63,7 @@ def criar_video(audio_path, imagens, saida, segment_duration=3, transicao=None,
         ]
         print(f"Executando: {' '.join(cmd)}")
         try:
-            subprocess.run(cmd, check=True)
+            _run_ffmpeg(cmd, creationflags=creationflags)
             print(f"Vídeo gerado com sucesso: {saida}")
         except subprocess.CalledProcessError as e:
             print(f"Erro ao gerar vídeo: {e}")
@@ -61,7 +74,8 @@ def criar_video(audio_path, imagens, saida, segment_duration=3, transicao=None,
         segment_map = {}
 
         # Renderiza cada imagem única uma vez (com cache)
-        segment_files_unicos = pre_render_segments(imagens_unicas, segment_duration, pre_dir, efeito=efeito, encoder=encoder, ffmpeg_path=ffmpeg_path, ffprobe_path=ffprobe_path)
+        segment_files_unicos = pre_render_segments(imagens_unicas, segment_duration, pre_dir, efeito=efeito, encoder=encoder, ffmpeg_path=ffmpeg_path, ffprobe_path=ffprobe_path,
+                                                   creationflags=creationflags)
         for img, seg in zip(imagens_unicas, segment_files_unicos):
             segment_map[img] = seg
 
@@ -72,10 +86,12 @@ def criar_video(audio_path, imagens, saida, segment_duration=3, transicao=None,
         try:
             tipo_transicao = transicao if isinstance(transicao, str) else 'fade'
             concat_with_transitions_singlepass(segment_files, audio_path=audio_path, saida=saida,
-                                               segment_duration=segment_duration,
+                                               segment_duration=seg_real,
                                                ffmpeg_path=ffmpeg_path, encoder=encoder,
                                                tipo_transicao=tipo_transicao,
-                                               transition=transition)
+                                               transition=transition,
+                                               single_frame=(efeito == 'none'),
+                                               creationflags=creationflags)
             print(f"Vídeo gerado com sucesso: {saida}")
         except subprocess.CalledProcessError as e:
             print(f"Erro ao gerar vídeo: {e}")
@@ -92,24 +108,31 @@ import math
 import subprocess
 import os
 import shutil
-import shlex
 from pathlib import Path
 import json
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
-def get_config():
-    config_path = os.path.join(os.path.dirname(__file__), '..', 'config.json')
-    if os.path.exists(config_path):
-        with open(config_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return {}
+# Framerate único de todo o pipeline (pré-render, concatenação e caminho sem transição)
+_FRAMERATE = 30
+
+
+def _frames_segmento(segment_duration):
+    """Quadros de um segmento pré-renderizado: int(d*fps) para todos os efeitos
+    (o round a 6 casas só absorve erro de ponto flutuante de durações já quantizadas)."""
+    return int(round(segment_duration * _FRAMERATE, 6))
 
 # ==========================
 # Utilitários de mídia
 # ==========================
 
+def _creationflags(hide_console):
+    """creationflags dos processos filhos: CREATE_NO_WINDOW só se pedido (host GUI no Windows), senão 0."""
+    return getattr(subprocess, 'CREATE_NO_WINDOW', 0) if hide_console else 0
 
-def get_audio_duration(audio_path, ffprobe_path):
+
+def get_audio_duration(audio_path, ffprobe_path, creationflags=0):
     """Retorna a duração do áudio em segundos usando ffprobe (ffprobe_path injetado)."""
     result = subprocess.run([
         ffprobe_path,
@@ -117,15 +140,14 @@ def get_audio_duration(audio_path, ffprobe_path):
         '-show_entries', 'format=duration',
         '-of', 'default=noprint_wrappers=1:nokey=1',
         audio_path
-    ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, creationflags=creationflags)
     try:
         return float(result.stdout.strip())
     except Exception:
         return 0
 
 
-
-def get_image_size(image_path: Path, ffprobe_path):
+def get_image_size(image_path: Path, ffprobe_path, creationflags=0):
     """Usa ffprobe para obter largura e altura da imagem (ffprobe_path injetado)."""
     cmd = [
         ffprobe_path, "-v", "error",
@@ -134,64 +156,131 @@ def get_image_size(image_path: Path, ffprobe_path):
         "-of", "json",
         str(image_path)
     ]
-    result = subprocess.run(cmd, stdout=subprocess.PIPE, check=True, text=True)
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, check=True, creationflags=creationflags)
     data = json.loads(result.stdout)
     w = data["streams"][0]["width"]
     h = data["streams"][0]["height"]
     return w, h
 
 
-def get_encoder_flags(encoder: str, framerate: int):
-    """Retorna flags apropriadas para diferentes encoders visando velocidade/qualidade."""
-    enc = (encoder or '').lower()
+def _run_ffmpeg(cmd, creationflags=0):
+    """Executa o ffmpeg sem ecoar o log no terminal; o stderr só é mostrado se o processo falhar."""
+    p = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, creationflags=creationflags)
+    if p.returncode:
+        print(p.stderr.decode('utf-8', errors='replace'))
+        raise subprocess.CalledProcessError(p.returncode, cmd, stderr=p.stderr)
+
+
+def probe_image_sizes(paths, ffprobe_path, creationflags=0):
+    """Retorna {caminho: (largura, altura)} para todas as imagens, sondando cada arquivo único uma vez e em paralelo."""
+    unicos = list(dict.fromkeys(paths))
+    if not unicos:
+        return {}
+    workers = min(len(unicos), os.cpu_count() or 2)
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        sizes = list(ex.map(lambda p: get_image_size(p, ffprobe_path, creationflags), unicos))
+    return dict(zip(unicos, sizes))
+
+
+def _encoder_flags(enc: str, framerate: int, intermediate: bool):
+    """Flags por encoder (enc já em minúsculas), como tupla imutável."""
+    if enc == 'libx264' and intermediate:
+        return ('-preset', 'ultrafast', '-tune', 'zerolatency', '-crf', '18', '-g', '1')
     if enc == 'libx264':
         # Boa qualidade e rapidez para still images
-        return ['-preset', 'veryfast', '-tune', 'stillimage', '-crf', '26', '-g', str(framerate * 2)]
+        return ('-preset', 'veryfast', '-tune', 'stillimage', '-crf', '26', '-g', str(framerate * 2))
     if enc == 'h264_nvenc':
         # NVENC rápido e estável
-        return ['-preset', 'p5', '-rc', 'constqp', '-qp', '23', '-g', str(framerate * 2), '-bf', '2']
+        return ('-preset', 'p5', '-rc', 'constqp', '-qp', '23', '-g', str(framerate * 2), '-bf', '2')
     if enc == 'h264_qsv':
         # Intel QuickSync
-        return ['-global_quality', '23', '-look_ahead', '0', '-g', str(framerate * 2)]
+        return ('-global_quality', '23', '-look_ahead', '0', '-g', str(framerate * 2))
     if enc == 'h264_amf':
         # AMD AMF
-        return ['-quality', 'speed', '-g', str(framerate * 2)]
-    return []
-    # ...existing code...
+        return ('-quality', 'speed', '-g', str(framerate * 2))
+    return ()
+
+
+# _FRAMERATE é o único framerate usado no módulo: flags prontas desde a importação
+_ENCODER_FLAGS_PADRAO = {
+    (enc, intermediate): _encoder_flags(enc, _FRAMERATE, intermediate)
+    for enc in ('libx264', 'h264_nvenc', 'h264_qsv', 'h264_amf')
+    for intermediate in (False, True)
+}
+
+
+def get_encoder_flags(encoder: str, framerate: int, intermediate: bool = False):
+    """Retorna flags apropriadas para diferentes encoders visando velocidade/qualidade.
+    intermediate=True: segmentos que serão decodificados e re-encodados na concatenação (rápido, all-I, alta qualidade)."""
+    enc = (encoder or '').lower()
+    if framerate == _FRAMERATE:
+        return list(_ENCODER_FLAGS_PADRAO.get((enc, intermediate), ()))
+    return list(_encoder_flags(enc, framerate, intermediate))
+
+
+# ==========================
 # Pré-render de segmentos (com cache)
 # ==========================
 
-def pre_render_segments(imagens, segment_duration, output_dir, efeito='fade', encoder='libx264'):
-    """Pré-renderiza cada imagem como um segmento .mp4 com efeito (fade, zoom, pendulo, simplezoom) e encoder escolhido. Usa cache se os parâmetros não mudaram."""
-def pre_render_segments(imagens, segment_duration, output_dir, efeito='fade', encoder='libx264', ffmpeg_path=None, ffprobe_path=None):
+# Incrementar quando o formato dos segmentos pré-renderizados mudar (invalida caches antigos)
+_PRERENDER_VERSION = 4
+
+# Máximo de segmentos (entradas/saídas) por processo ffmpeg na pré-renderização (libx264)
+_SEGMENTS_PER_PROCESS = 8
+
+# Sessões de encoder simultâneas = _prerender_workers * _segments_per_process. Nos encoders de GPU
+# cada saída abre uma sessão de hardware, e as placas de consumo limitam isso (NVENC: 3, 5 ou 8
+# conforme o driver): 2 processos x 1 saída = 2 sessões, dentro do limite de qualquer placa.
+def _segments_per_process(encoder):
+    """Saídas por processo ffmpeg: lotes de _SEGMENTS_PER_PROCESS no x264, 1 nos encoders de GPU."""
+    return _SEGMENTS_PER_PROCESS if (encoder or '').lower() == 'libx264' else 1
+
+
+def _prerender_workers(encoder, n_jobs):
+    """Quantos ffmpeg rodar em paralelo: metade dos núcleos no x264, 2 nos encoders de GPU (evita disputa)."""
+    enc = (encoder or '').lower()
+    if enc == 'libx264':
+        limite = max(1, (os.cpu_count() or 2) // 2)
+    else:
+        limite = 2
+    return max(1, min(limite, n_jobs))
+
+
+def _prerender_hash(imagens_abs, segment_duration, efeito, encoder, framerate):
+    """Hash de validade do cache (não criptográfico): campos separados por NUL, sem serializar JSON."""
+    h = hashlib.blake2b(digest_size=16)
+    for campo in (_PRERENDER_VERSION, segment_duration, efeito, encoder, framerate):
+        h.update(str(campo).encode('utf-8'))
+        h.update(b'\0')
+    for img in imagens_abs:
+        h.update(img.encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def pre_render_segments(imagens, segment_duration, output_dir, efeito='fade', encoder='libx264', ffmpeg_path=None, ffprobe_path=None, creationflags=0):
     """Pré-renderiza cada imagem como um segmento .mp4 com efeito (fade, zoom, pendulo, simplezoom) e encoder escolhido. Usa cache se os parâmetros não mudaram."""
     if ffmpeg_path is None:
         raise ValueError('ffmpeg_path deve ser fornecido')
     if ffprobe_path is None:
         raise ValueError('ffprobe_path deve ser fornecido')
-    framerate = 30
+    framerate = _FRAMERATE
 
     # Gera hash dos parâmetros relevantes (ordem e caminhos normalizados)
-    imagens_abs = [os.path.normcase(os.path.abspath(img)) for img in imagens]
-    param_dict = {
-        'imagens': imagens_abs,
-        'segment_duration': segment_duration,
-        'efeito': efeito,
-        'encoder': encoder,
-        'framerate': framerate
-    }
-    param_str = json.dumps(param_dict, sort_keys=True, ensure_ascii=False)
-    param_hash = hashlib.md5(param_str.encode('utf-8')).hexdigest()
+    # abspath calculado uma só vez por imagem: serve ao hash e aos renderizadores
+    imagens_abs = [os.path.abspath(img) for img in imagens]
+    param_hash = _prerender_hash([os.path.normcase(p) for p in imagens_abs], segment_duration, efeito, encoder, framerate)
 
     os.makedirs(output_dir, exist_ok=True)
     hash_file = os.path.join(output_dir, 'prerender.hash')
+    segment_prefix = os.path.join(output_dir, 'segment_')
 
     # Cache válido?
     if os.path.exists(hash_file):
         try:
             with open(hash_file, 'r', encoding='utf-8') as f:
                 old_hash = f.read().strip()
-            segment_files = [os.path.join(output_dir, f'segment_{idx:04d}.mp4') for idx in range(len(imagens))]
+            segment_files = [f'{segment_prefix}{idx:04d}.mp4' for idx in range(len(imagens))]
             if old_hash == param_hash and all(os.path.exists(f) for f in segment_files):
                 print(f"Pré-renderização já existente e válida em {output_dir}, reutilizando.")
                 return segment_files
@@ -201,23 +290,38 @@ def pre_render_segments(imagens, segment_duration, output_dir, efeito='fade', en
         shutil.rmtree(output_dir, ignore_errors=True)
         os.makedirs(output_dir, exist_ok=True)
 
+    # Monta todos os segmentos antes, agrupa em lotes (um ffmpeg por lote) e roda os lotes em paralelo
+    n_jobs = len(imagens_abs)
+    workers = _prerender_workers(encoder, n_jobs)
+    # Pelo menos um lote por worker; lotes de até _segments_per_process saídas (memória / sessões de GPU)
+    n_lotes = max(workers, math.ceil(n_jobs / _segments_per_process(encoder)))
+    # Encoders simultâneos = workers * saídas por lote: divide os núcleos entre eles
+    threads = max(1, (os.cpu_count() or 1) // (workers * max(1, math.ceil(n_jobs / n_lotes))))
     segment_files = []
-    for idx, img in enumerate(imagens):
-        out_file = os.path.join(output_dir, f'segment_{idx:04d}.mp4')
+    jobs = []
+    # Pêndulo precisa da razão de aspecto: sonda todas as imagens antes, num único lote
+    sizes = probe_image_sizes(imagens_abs, ffprobe_path, creationflags) if efeito == 'pendulo' else {}
+    for idx, img in enumerate(imagens_abs):
+        out_file = f'{segment_prefix}{idx:04d}.mp4'
         if efeito == 'zoom':
-            cmd = render_zoom(img, out_file, segment_duration, ffmpeg_path, encoder, framerate)
+            job = render_zoom(img, out_file, segment_duration, encoder, framerate, threads=threads)
         elif efeito == 'pendulo':
-            cmd = render_pendulo(img, out_file, segment_duration, ffmpeg_path, encoder, framerate)
+            job = render_pendulo(img, out_file, segment_duration, encoder, framerate, sizes[img], threads=threads)
         elif efeito == 'simplezoom':
-            cmd = render_simplezoom(img, out_file, segment_duration, ffmpeg_path, encoder, framerate)
+            job = render_simplezoom(img, out_file, segment_duration, encoder, framerate, threads=threads)
         elif efeito == 'none':
-            cmd = render_none(img, out_file, segment_duration, ffmpeg_path, encoder, framerate)
+            job = render_none(img, out_file, segment_duration, encoder, framerate, threads=threads)
         else:
-            cmd = render_fade(img, out_file, segment_duration, ffmpeg_path, encoder, framerate)
-        print(f"Pré-renderizando segmento: {out_file} [{efeito}, {encoder}, {framerate}fps]")
-        subprocess.run(cmd, check=True)
+            job = render_fade(img, out_file, segment_duration, encoder, framerate, threads=threads)
+        jobs.append(job)
         segment_files.append(out_file)
 
+    cmds = [_segment_batch_cmd(ffmpeg_path, jobs[k::n_lotes]) for k in range(n_lotes) if jobs[k::n_lotes]]
+    print(f"Pré-renderizando {len(jobs)} segmento(s) em {output_dir} [{efeito}, {encoder}, {framerate}fps, {len(cmds)} lote(s), {workers} processo(s), {threads} thread(s)/encoder]")
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        # list() propaga o primeiro CalledProcessError, como no laço sequencial
+        list(ex.map(lambda c: _run_ffmpeg(c, creationflags), cmds))
+
     # Salva hash ao final do processo bem-sucedido
     try:
         with open(hash_file, 'w', encoding='utf-8') as f:
@@ -230,207 +334,241 @@ def pre_render_segments(imagens, segment_duration, output_dir, efeito='fade', en
 
 # ==========================
 # Renderizadores de segmentos
+# (img já chega como caminho absoluto, ver pre_render_segments)
+# Cada um devolve (opções de entrada, filtro, opções de saída); _segment_batch_cmd monta o comando.
+# threads: threads do encoder por saída (0 = automático do ffmpeg).
 # ==========================
 
-def render_none(img, out_file, segment_duration, ffmpeg_path, encoder, framerate):
-    """Renderiza a imagem sem efeito, apenas scale/pad."""
+def _segment_batch_cmd(ffmpeg_path, jobs):
+    """Um único ffmpeg para vários segmentos: uma entrada e uma saída (-map) por segmento.
+    Os codecs são inicializados uma vez por processo em vez de uma vez por segmento."""
+    cmd = [ffmpeg_path, '-y', '-loglevel', 'error', '-nostats']
+    grafo = []
+    for k, (entrada, vf, _) in enumerate(jobs):
+        cmd += entrada
+        grafo.append(f"[{k}:v]{vf}[v{k}]")
+    cmd += ['-filter_complex', ';'.join(grafo)]
+    for k, (_, _, saida) in enumerate(jobs):
+        cmd += ['-map', f'[v{k}]', *saida]
+    return cmd
+
+
+def render_none(img, out_file, segment_duration, encoder, framerate, threads=0):
+    """Renderiza a imagem sem efeito, apenas scale/pad, como um ÚNICO quadro.
+    O quadro é repetido por segment_duration na concatenação (ver concat_with_transitions_singlepass, single_frame)."""
     vf = "scale=1280:720:force_original_aspect_ratio=decrease,pad=1280:720:(ow-iw)/2:(oh-ih)/2"
-    extra_enc = get_encoder_flags(encoder, framerate)
-    cmd = [
-        ffmpeg_path,
-        '-y',
-        '-loop', '1',
-        '-t', str(segment_duration),
-        '-i', os.path.abspath(img),
-        '-vf', vf,
+    extra_enc = get_encoder_flags(encoder, framerate, intermediate=True)
+    entrada = ['-i', img]
+    saida = [
         '-r', str(framerate),
         '-c:v', encoder, *extra_enc,
+        '-threads', str(threads),
         '-movflags', '+faststart',
         '-pix_fmt', 'yuv420p',
         '-an',
+        '-frames:v', '1',
         out_file
     ]
-    return cmd
+    return entrada, vf, saida
 
 
-def render_simplezoom(img, out_file, segment_duration, ffmpeg_path, encoder, framerate):
+def render_simplezoom(img, out_file, segment_duration, encoder, framerate, threads=0):
     """Zoom simples (in) durante o segmento."""
-    d_frames = int(segment_duration * framerate)
+    d_frames = _frames_segmento(segment_duration)
     zoom_expr = f"zoom='1+0.1*on/{d_frames}':x='iw/2-(iw/zoom/2)':y='ih/2-(ih/zoom/2)':d={d_frames}:s=1280x720:fps={framerate}"
     vf = f"scale=1280:720,zoompan={zoom_expr}"
-    extra_enc = get_encoder_flags(encoder, framerate)
-    cmd = [
-        ffmpeg_path,
-        '-y',
-        '-loop', '1',
-        '-i', os.path.abspath(img),
-        '-vf', vf,
+    extra_enc = get_encoder_flags(encoder, framerate, intermediate=True)
+    entrada = ['-loop', '1', '-i', img]
+    saida = [
         '-c:v', encoder, *extra_enc,
+        '-threads', str(threads),
         '-movflags', '+faststart',
         '-pix_fmt', 'yuv420p',
         '-an',
         '-frames:v', str(d_frames),
         out_file
     ]
-    return cmd
+    return entrada, vf, saida
 
 
-def render_fade(img, out_file, segment_duration, ffmpeg_path, encoder, framerate):
+def render_fade(img, out_file, segment_duration, encoder, framerate, threads=0):
     fade = min(1, segment_duration/2)
     vf = f"scale=1280:720,fade=t=in:st=0:d={fade},fade=t=out:st={segment_duration-fade}:d={fade}"
-    extra_enc = get_encoder_flags(encoder, framerate)
-    cmd = [
-        ffmpeg_path,
-        '-y',
-        '-loop', '1',
-        '-t', str(segment_duration),
-        '-i', os.path.abspath(img),
-        '-vf', vf,
+    extra_enc = get_encoder_flags(encoder, framerate, intermediate=True)
+    entrada = ['-loop', '1', '-t', str(segment_duration), '-i', img]
+    saida = [
         '-r', str(framerate),
         '-c:v', encoder, *extra_enc,
+        '-threads', str(threads),
         '-movflags', '+faststart',
         '-pix_fmt', 'yuv420p',
         '-an',
+        '-frames:v', str(_frames_segmento(segment_duration)),
         out_file
     ]
-    return cmd
+    return entrada, vf, saida
 
 
-def render_zoom(img, out_file, segment_duration, ffmpeg_path, encoder, framerate):
-    d_frames = int(segment_duration * framerate)
+def render_zoom(img, out_file, segment_duration, encoder, framerate, threads=0):
+    d_frames = _frames_segmento(segment_duration)
     zoom_expr = f"zoom='if(lte(on,1),1,1+0.1*on/{d_frames})':x='iw/2-(iw/zoom/2)':y='ih/2-(ih/zoom/2)':d={d_frames}:s=1280x720:fps={framerate}"
     vf = f"scale=1280:720,zoompan={zoom_expr}"
-    extra_enc = get_encoder_flags(encoder, framerate)
-    cmd = [
-        ffmpeg_path,
-        '-y',
-        '-loop', '1',
-        '-i', os.path.abspath(img),
-        '-vf', vf,
+    extra_enc = get_encoder_flags(encoder, framerate, intermediate=True)
+    entrada = ['-loop', '1', '-i', img]
+    saida = [
         '-c:v', encoder, *extra_enc,
+        '-threads', str(threads),
         '-movflags', '+faststart',
         '-pix_fmt', 'yuv420p',
         '-an',
         '-frames:v', str(d_frames),
         out_file
     ]
-    return cmd
+    return entrada, vf, saida
 
 
-def render_pendulo(img, out_file, segment_duration, ffmpeg_path, encoder, framerate):
-    """Efeito pêndulo com pré-zoom e CROP final (zoom visível)."""
-def render_pendulo(img, out_file, segment_duration, ffmpeg_path, encoder, framerate, ffprobe_path):
-    w, h = get_image_size(img, ffprobe_path)
-    r = h / w  # razão de aspecto
+# Parâmetros fixos do pêndulo (0..100), resolvidos uma vez na importação
+_PEND_STRENGTH, _PEND_TWIST, _PEND_SPEED, _PEND_SHARPEN = 5, 5, 12, 30
+_PEND_FINAL_W, _PEND_FINAL_H = 1920, 1080
 
-    strength, twist, speed, sharpen = 5, 5, 12, 30
-    final_width, final_height = 1920, 1080
+_PEND_A_DEG = 12 * (max(0, min(100, _PEND_STRENGTH)) / 100.0)
+_PEND_FREQ = 0.2 + 1.8 * (max(0, min(100, _PEND_SPEED)) / 100.0)
+_PEND_SH = 0.30 * (max(0, min(100, _PEND_TWIST)) / 100.0)
+_PEND_AMT = 1.50 * (max(0, min(100, _PEND_SHARPEN)) / 100.0)
+_PEND_A_RAD = math.radians(_PEND_A_DEG)
+_PEND_A_EXPR = f"({_PEND_A_DEG}*PI/180)"
 
-    A_deg = 12 * (max(0, min(100, strength)) / 100.0)
-    freq = 0.2 + 1.8 * (max(0, min(100, speed)) / 100.0)
-    sh = 0.30 * (max(0, min(100, twist)) / 100.0)
-    amt = 1.50 * (max(0, min(100, sharpen)) / 100.0)
+# Trecho do filtro que não depende da imagem
+_PEND_VF_TAIL = (
+    f"shear=shx={_PEND_SH}:shy=-{_PEND_SH},"                               # opcional: torção leve
+    f"rotate={_PEND_A_EXPR}*sin(2*PI*{_PEND_FREQ}*t):ow=iw:oh=ih:bilinear=0,"  # rotação senoidal (rápida)
+    f"unsharp=7:7:{_PEND_AMT}:7:7:0,"                                      # nitidez (pode remover p/ +performance)
+    f"crop={_PEND_FINAL_W}:{_PEND_FINAL_H},"                               # mantém o zoom no enquadramento
+    f"pad=ceil(iw/2)*2:ceil(ih/2)*2,setsar=1"
+)
 
-    A_rad = math.radians(A_deg)
 
-    def zoom_needed(theta, aspect):
-        c = abs(math.cos(theta))
-        s = abs(math.sin(theta))
-        return max(c + aspect * s, s + (1.0 / aspect) * c)
+def _zoom_needed(theta, aspect):
+    """Zoom mínimo para que a imagem girada por theta cubra o quadro sem bordas."""
+    c = abs(math.cos(theta))
+    s = abs(math.sin(theta))
+    return max(c + aspect * s, s + (1.0 / aspect) * c)
 
+
+@lru_cache(maxsize=None)
+def _pendulo_vf(r):
+    """Filtro do pêndulo para uma razão de aspecto r = h/w (arredondada); calculado uma vez por proporção."""
     # ZOOM mínimo para não aparecer borda + pequena folga
-    ZOOM = zoom_needed(A_rad, r) * 1.06
+    zoom = _zoom_needed(_PEND_A_RAD, r) * 1.06
+    return f"scale=iw*{zoom}:ih*{zoom}:flags=fast_bilinear," + _PEND_VF_TAIL  # pré-zoom
 
-    A_expr = f"({A_deg}*PI/180)"
 
-    vf = (
-        f"scale=iw*{ZOOM}:ih*{ZOOM}:flags=fast_bilinear,"          # pré-zoom
-        f"shear=shx={sh}:shy=-{sh},"                               # opcional: torção leve
-        f"rotate={A_expr}*sin(2*PI*{freq}*t):ow=iw:oh=ih:bilinear=0,"  # rotação senoidal (rápida)
-        f"unsharp=7:7:{amt}:7:7:0,"                                # nitidez (pode remover p/ +performance)
-        f"crop={final_width}:{final_height},"                      # mantém o zoom no enquadramento
-        f"pad=ceil(iw/2)*2:ceil(ih/2)*2,setsar=1"
-    )
+def render_pendulo(img, out_file, segment_duration, encoder, framerate, size, threads=0):
+    """Efeito pêndulo com pré-zoom e CROP final (zoom visível). size = (largura, altura) da imagem, ver probe_image_sizes."""
+    w, h = size
+    vf = _pendulo_vf(round(h / w, 4))  # imagens com a mesma proporção reaproveitam o filtro
 
-    extra_enc = get_encoder_flags(encoder, framerate)
+    extra_enc = get_encoder_flags(encoder, framerate, intermediate=True)
 
-    cmd = [
-        ffmpeg_path, '-y',
-        '-loop', '1',
-        '-t', str(segment_duration),
-        '-i', os.path.abspath(img),
-        '-vf', vf,
+    entrada = ['-loop', '1', '-t', str(segment_duration), '-i', img]
+    saida = [
         '-r', str(framerate),
         '-c:v', encoder, *extra_enc,
+        '-threads', str(threads),
         '-movflags', '+faststart',
         '-pix_fmt', 'yuv420p',
-        '-threads', '0',
-        '-filter_threads', '0',
         '-an',
+        '-frames:v', str(_frames_segmento(segment_duration)),
         out_file
     ]
-    return cmd
+    return entrada, vf, saida
 
 
 # ==========================
 # Concatenação com transições (single pass)
 # ==========================
 
+# Acima disso, volta ao concat demuxer: cada input é um decoder H.264 aberto durante toda a passada
+_MAX_SEGMENT_INPUTS = 16
+
+
 def concat_with_transitions_singlepass(segment_files, audio_path, saida,
                                        segment_duration, ffmpeg_path, encoder,
-                                       tipo_transicao='fade', transition=None):
+                                       tipo_transicao='fade', transition=None, single_frame=False, creationflags=0):
     """
     Junta N segmentos com transições em UMA passada usando:
-      - concat demuxer (gera [0:v])
-      - trim + setpts para recortar cada bloco
+      - um input por segmento ([i:v]), sem arquivo de lista nem trim
+        (acima de _MAX_SEGMENT_INPUTS: concat demuxer em [0:v] + trim + setpts por bloco)
       - xfade em cascata com offsets acumulados
     Requer que todos os segments tenham mesma resolução/fps/codec.
+    Com single_frame=True cada segmento tem um só quadro (efeito 'none'), repetido até segment_duration.
+    segment_duration deve ser a duração quantizada dos segmentos (_frames_segmento / _FRAMERATE),
+    a mesma usada em criar_video para calcular a cobertura.
     """
     if transition is None:
         transition = min(1.0, segment_duration * 0.3)
+    framerate = _FRAMERATE
 
     workdir = os.path.dirname(os.path.abspath(saida)) or '.'
-    concat_list = os.path.join(workdir, 'concat_segments.txt')
+    concat_list = None
     graph_path  = os.path.join(workdir, 'xfade_graph.txt')
 
-    # 1) lista para o concat demuxer (reduz N arquivos a 1 input [0:v])
-    with open(concat_list, 'w', encoding='utf-8') as f:
-        for seg in segment_files:
-            f.write(f"file '{os.path.abspath(seg)}'\n")
+    # 1) entradas de vídeo
+    n = len(segment_files)
+    por_input = n <= _MAX_SEGMENT_INPUTS
+    if por_input:
+        # um thread de decodificação por input (sem -threads 1, cada decoder abre ~núcleos threads)
+        video_inputs = [a for seg in segment_files for a in ('-threads', '1', '-i', os.path.abspath(seg))]
+        fontes = [f"[{i}:v]" for i in range(n)]
+    else:
+        # lista para o concat demuxer (reduz N arquivos a 1 input [0:v])
+        concat_list = os.path.join(workdir, 'concat_segments.txt')
+        Path(concat_list).write_text(''.join(f"file '{os.path.abspath(seg)}'\n" for seg in segment_files), encoding='utf-8')
+        video_inputs = ['-f', 'concat', '-safe', '0', '-i', concat_list]
+        fontes = ["[0:v]"] * n
+    audio_idx = n if por_input else 1
 
     # 2) grafo de filtros
-    n = len(segment_files)
     lines = []
 
-    # recortes exatos de cada segmento (assumindo duração fixa por segmento)
-    for i in range(n):
-        start = i * segment_duration
-        end   = start + segment_duration
-        lines.append(f"[0:v]trim=start={start}:end={end},setpts=PTS-STARTPTS[v{i}]")
+    if single_frame:
+        # um quadro por segmento, repetido até _frames_segmento quadros (mesmo comprimento dos outros efeitos)
+        d_frames = max(1, _frames_segmento(segment_duration))
+        for i in range(n):
+            recorte = "" if por_input else f"trim=start_frame={i}:end_frame={i + 1},setpts=PTS-STARTPTS,"
+            lines.append(f"{fontes[i]}{recorte}"
+                         f"loop=loop={d_frames - 1}:size=1:start=0,setpts=N/{framerate}/TB[v{i}]")
+    elif por_input:
+        for i in range(n):
+            lines.append(f"{fontes[i]}setpts=PTS-STARTPTS[v{i}]")
+    else:
+        # recortes exatos de cada segmento (assumindo duração fixa por segmento)
+        for i in range(n):
+            start = i * segment_duration
+            end   = start + segment_duration
+            lines.append(f"[0:v]trim=start={start}:end={end},setpts=PTS-STARTPTS[v{i}]")
 
     if n == 1:
         lines.append(f"[v0]copy[vout]")
     else:
-        prev = "[v0]"
-        for i in range(1, n):
-            # offset acumulado = i*segment_duration - i*transition
-            offset = i * segment_duration - i * transition
-            lines.append(f"{prev}[v{i}]xfade=transition={tipo_transicao}:duration={transition}:offset={offset}[x{i}]")
-            prev = f"[x{i}]"
-        lines.append(f"{prev}copy[vout]")
+        # entrada esquerda de cada xfade: [v0] e depois a saída do xfade anterior
+        prevs = ["[v0]"] + [f"[x{i}]" for i in range(1, n)]
+        # offset acumulado = i*segment_duration - i*transition
+        lines += [f"{prevs[i - 1]}[v{i}]xfade=transition={tipo_transicao}:duration={transition}:offset={i * segment_duration - i * transition}[x{i}]"
+                  for i in range(1, n)]
+        lines.append(f"{prevs[-1]}copy[vout]")
 
-    with open(graph_path, 'w', encoding='utf-8') as f:
-        f.write(";\n".join(lines))
+    Path(graph_path).write_text(";\n".join(lines), encoding='utf-8')
 
-    extra_enc = get_encoder_flags(encoder, framerate=30)
+    extra_enc = get_encoder_flags(encoder, framerate=framerate)
 
     # 3) uma chamada do ffmpeg para vídeo + áudio
     cmd = [
-        ffmpeg_path, '-y',
-        '-f', 'concat', '-safe', '0', '-i', concat_list,  # -> [0:v]
-        '-i', audio_path,                                  # -> [1:a]
+        ffmpeg_path, '-y', '-loglevel', 'error', '-nostats',
+        *video_inputs,                                     # -> [0:v] .. [n-1:v] (ou só [0:v])
+        '-i', audio_path,                                  # -> [audio_idx:a]
         '-filter_complex_script', graph_path,
-        '-map', '[vout]', '-map', '1:a',
+        '-map', '[vout]', '-map', f'{audio_idx}:a',
         '-c:v', encoder, *extra_enc,
         '-c:a', 'aac',
         '-pix_fmt', 'yuv420p',
@@ -439,18 +577,13 @@ def concat_with_transitions_singlepass(segment_files, audio_path, saida,
         saida
     ]
     print("Executando:", " ".join(cmd))
-    subprocess.run(cmd, check=True)
+    _run_ffmpeg(cmd, creationflags=creationflags)
 
     # limpeza
     try:
-        os.remove(concat_list)
+        if concat_list:
+            os.remove(concat_list)
         os.remove(graph_path)
     except Exception:
         pass
 
-
-# ==========================
-# Função principal
-# ==========================
-
-    # ...existing code...